@@ -1,51 +1,180 @@
 import os
 import sys
+import json
 import time
 import shutil
+import hashlib
 import queue
 import threading
 import logging
+from pathlib import Path
+from collections import deque, namedtuple
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import scrolledtext
 from tkinter import messagebox
-from watchdog.observers.polling import PollingObserver as Observer
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
 from dotenv import load_dotenv
 
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.CreateFileW.restype = wintypes.HANDLE
+    _kernel32.CreateFileW.argtypes = (wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                                      wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE)
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+    GENERIC_READ = 0x80000000
+    FILE_SHARE_READ = 0x1
+    OPEN_EXISTING = 3
+    FILE_ATTRIBUTE_NORMAL = 0x80
+    INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+    DRIVE_REMOTE = 4
+
 from email_sender import send_invoice
 from peppol import OdooClient
 
 # testing
-# BASE_DIR = "./"
-# WATCH_FOLDER = os.path.join(BASE_DIR, "Factuur")
+# BASE_DIR = Path("./")
+# WATCH_FOLDER = BASE_DIR / "Factuur"
+
+BASE_DIR = Path(r"C:\Users\samee\OneDrive\Desktop\Facturen")
+WATCH_FOLDER = Path(r"\\PC1\Factuur")
+
+# Records are handed to a queue, the listener thread does the file I/O
+log_queue = queue.SimpleQueue()
+file_handler = RotatingFileHandler(BASE_DIR / "peppol.log", maxBytes=1_000_000, backupCount=3)
+file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+log_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+log_listener.start()
+
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+
+load_dotenv(BASE_DIR / ".env")
 
-BASE_DIR = r"C:\Users\samee\OneDrive\Desktop\Facturen"
-WATCH_FOLDER = r"\\PC1\Factuur"
+# Odoo credentials, read once at import
+OdooConfig = namedtuple("OdooConfig", "url db api_key")
+ODOO = OdooConfig(os.getenv("ODOO_URL"), os.getenv("ODOO_DB"), os.getenv("ODOO_API_KEY"))
 
-logging.basicConfig(
-    filename= os.path.join(BASE_DIR, "peppol.log"),
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s %(message)s"
-)
+# Test
+# ODOO = OdooConfig(os.getenv("TEST_ODOO_URL"), os.getenv("TEST_ODOO_DB"), os.getenv("TEST_ODOO_API_KEY"))
 
-load_dotenv(os.path.join(BASE_DIR, ".env"))
+MISSING_ODOO_SETTINGS = [field for field, value in ODOO._asdict().items() if not value]
 
-SENT_FOLDER = os.path.join(BASE_DIR, "Factuur_sent")
-POSTED_FOLDER = os.path.join(BASE_DIR, "Factuur_not_sent")
-ERROR_FOLDER = os.path.join(BASE_DIR, "Factuur_error")
+SENT_FOLDER = BASE_DIR / "Factuur_sent"
+POSTED_FOLDER = BASE_DIR / "Factuur_not_sent"
+ERROR_FOLDER = BASE_DIR / "Factuur_error"
+# Local copies of the invoices on the share, processed and then moved on the same volume
+STAGING_FOLDER = BASE_DIR / "staging"
+# Fingerprints of processed invoices, skips re-parsing a PDF that is dropped again.
+# One JSON record per line, appended per invoice and compacted at startup
+PROCESSED_CACHE = BASE_DIR / "processed_invoices.jsonl"
+# Files above this size are fingerprinted on their head, tail and size only
+FINGERPRINT_FULL_LIMIT = 4 * 1024 * 1024
+FINGERPRINT_CHUNK = 64 * 1024
 
-# Check the queue every 5 seconds
-QUEUE_CHECKER_TIME = 2000 # ms
+# Heartbeat for the network check and periodic rescan, new files are signalled via NEW_INVOICE_EVENT
+HEARTBEAT_TIME = 60000 # ms
+NEW_INVOICE_EVENT = "<<NewInvoice>>"
+
+# Poll interval (s) on network shares, native change notifications are unreliable there
+WATCH_POLL_INTERVAL = int(os.getenv("WATCH_POLL_INTERVAL", "30"))
+NETWORK_FS_TYPES = {"cifs", "smb3", "smbfs", "nfs", "nfs4", "fuse.sshfs"}
+
+# Seconds a network share reachability probe stays valid
+REACHABILITY_TTL = 5
+
+# Activity log is flushed to the widget at most every LOG_FLUSH_TIME and trimmed to LOG_KEEP_LINES past LOG_MAX_LINES
+LOG_FLUSH_TIME = 50 # ms
+LOG_MAX_LINES = 2000
+LOG_KEEP_LINES = 1000
+
+# Invoices processed in parallel, the work is bound by Odoo round-trips
+MAX_WORKERS = 4
+# Caps the requests in flight to Odoo regardless of queue depth or pool size,
+# below MAX_WORKERS so PDF parsing of other invoices overlaps the round-trips
+ODOO_MAX_INFLIGHT = int(os.getenv("ODOO_MAX_INFLIGHT", str(max(1, MAX_WORKERS // 2))))
+
+_PDF_EXTS = (".pdf", ".PDF")
+
+def is_pdf(name):
+    """ Suffix check that only lowercases the extension for mixed-case names """
+    return name.endswith(_PDF_EXTS) or name[-4:].lower() == ".pdf"
 
 # Event handler for watchdog
 class PDFHandler(FileSystemEventHandler):
-    def __init__(self, file_queue):
-        self.file_queue = file_queue
+    DEBOUNCE = 1.0 # s, duplicate events for a path within this window are dropped
+    PRUNE_AFTER = 10.0 # s
+
+    def __init__(self, enqueue):
+        self.enqueue = enqueue
+        self._recent = {}
+        self._lock = threading.Lock()
 
     def on_created(self, event):
-        if event.is_directory or not event.src_path.lower().endswith('.pdf'):
+        if event.is_directory or not is_pdf(event.src_path):
             return
-        self.file_queue.put(event.src_path)
+
+        now = time.monotonic()
+        with self._lock:
+            if now - self._recent.get(event.src_path, -self.DEBOUNCE) < self.DEBOUNCE:
+                return
+            self._recent[event.src_path] = now
+            self._recent = {p: ts for p, ts in self._recent.items() if now - ts < self.PRUNE_AFTER}
+
+        self.enqueue(event.src_path)
+
+def is_network_path(path):
+    """
+    Whether path lives on a network filesystem
+    :param path: folder path
+    :return: True for UNC paths, mapped network drives and SMB/NFS mounts
+    """
+    path = os.path.abspath(path)
+    if sys.platform == "win32":
+        if path.startswith("\\\\"):
+            return True
+        drive = os.path.splitdrive(path)[0] + "\\"
+        return ctypes.windll.kernel32.GetDriveTypeW(drive) == DRIVE_REMOTE
+
+    # Longest mount point containing the path decides the filesystem type
+    fs_type, mount_len = None, -1
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = fields[1]
+                if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > mount_len:
+                    fs_type, mount_len = fields[2], len(mount_point)
+    except OSError:
+        return False
+    return fs_type in NETWORK_FS_TYPES
+
+def check_file_released(file_path):
+    """
+    Raises OSError while another process still has the file open for writing.
+    On Windows the file is opened denying write sharing, a writer makes this fail
+    with ERROR_SHARING_VIOLATION. Elsewhere the last byte is read.
+    :param file_path: file path
+    """
+    if sys.platform == "win32":
+        handle = _kernel32.CreateFileW(file_path, GENERIC_READ, FILE_SHARE_READ, None,
+                                       OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, None)
+        if handle == INVALID_HANDLE_VALUE:
+            raise ctypes.WinError(ctypes.get_last_error())
+        _kernel32.CloseHandle(handle)
+        return
+
+    with open(file_path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        f.read(1)
 
 def wait_for_file_ready(file_path, timeout=10):
     """
@@ -54,13 +183,21 @@ def wait_for_file_ready(file_path, timeout=10):
     :param timeout: time to wait
     :return: whether file is ready or not (bool)
     """
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    prev_size = -1
+    while time.monotonic() < deadline:
         try:
-            os.rename(file_path, file_path)
-            return True
+            check_file_released(file_path)
+            # Same non-zero size on two consecutive probes means the copy has finished
+            size = os.stat(file_path).st_size
+            if size == prev_size and size > 0:
+                return True
+            prev_size = size
         except OSError:
-            time.sleep(1)
+            prev_size = -1
+        time.sleep(delay)
+        delay = min(delay * 1.5, 0.5)
     return False
 
 
@@ -70,35 +207,36 @@ class App:
         self.root.title("Peppol Odoo Integration")
         self.root.geometry("700x500")
 
-        # Queue for files detected by Watchdog
-        self.file_queue = queue.Queue()
+        # Queue for files detected by Watchdog, drained in one swap by the main thread
+        self.file_queue = deque()
+        self.file_queue_lock = threading.Lock()
+
+        # Activity log messages waiting for the next flush
+        self._pending_logs: list[tuple[str, str | None]] = []
+        self._pending_logs_lock = threading.Lock()
+        self._log_flush_scheduled = False
+        self._log_lines = 0
+
+        # Paths queued or being processed, guards against duplicate processing
+        self.enqueued: set[str] = set()
+        self.enqueued_lock = threading.Lock()
+
+        # fingerprint -> invoice record of every invoice already in Odoo
+        self.processed = load_processed_cache()
+        logging.log(logging.INFO, f"Processed invoice cache: {PROCESSED_CACHE} ({len(self.processed)} entries)")
+        self.processed_lock = threading.Lock()
 
         self.observer = None
         self.is_running = False
-        self.queue_busy = False
 
-        # Odoo credentials
-        self.URL = os.getenv("ODOO_URL")
-        self.DB = os.getenv("ODOO_DB")
-        self.API_KEY = os.getenv("ODOO_API_KEY")
+        self.pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="invoice")
 
-        # Test
-        # self.URL = os.getenv("TEST_ODOO_URL")
-        # self.DB = os.getenv("TEST_ODOO_DB")
-        # self.API_KEY = os.getenv("TEST_ODOO_API_KEY")
+        # (timestamp, reachable) of the last share probe, reachable is None until the first probe
+        self._reach_cache = (float("-inf"), None)
+        self._reach_probing = False
 
         self.odoo = None
 
-        try:
-            self.odoo = OdooClient(self.URL, self.DB, self.API_KEY)
-            self.odoo.connect()
-            self.log("Connected to Odoo successfully.", "success")
-            logging.log(logging.INFO, f"Connected to Odoo successfully at {self.URL}")
-            self.log(f"URL = {self.URL}")
-        except Exception as e:
-            self.log(f"Odoo Connection Failed", "error")
-            logging.log(logging.ERROR, f"Odoo Connection Failed: {e}")
-
         # --- GUI COMPONENTS ---
         header_frame = tk.Frame(root)
         header_frame.pack(pady=10, fill=tk.X, padx=20)
@@ -121,17 +259,48 @@ class App:
         self.log_area.tag_config("gray", foreground="gray")
 
         # Ensure ALL folders exist
-        for folder in [SENT_FOLDER, POSTED_FOLDER, ERROR_FOLDER]:
+        for folder in [SENT_FOLDER, POSTED_FOLDER, ERROR_FOLDER, STAGING_FOLDER]:
             os.makedirs(folder, exist_ok=True)
 
         self.log(f"System Ready. Watching: {os.path.abspath(WATCH_FOLDER)}")
 
         # periodic scan of folder if watchdog fails
-        self.last_scan = time.time()
+        self.last_scan = time.monotonic()
 
-        # Start the queue checker loop
-        self.root.after(QUEUE_CHECKER_TIME, self.check_queue)
+        # Drain the queue whenever a file is enqueued, the heartbeat only monitors the share
+        self.root.bind(NEW_INVOICE_EVENT, self._drain_queue)
+        self.root.after(HEARTBEAT_TIME, self.check_queue)
 
+        # Connect in the background so the window paints first, monitoring starts once connected
+        self.status_label.config(text="Status: CONNECTING TO ODOO...", fg="orange")
+        self.btn_toggle.config(state=tk.DISABLED)
+        self.pool.submit(self._bg_connect)
+
+    def _bg_connect(self):
+        """ Runs in the worker pool """
+        client, error = None, None
+        try:
+            # Fail fast on an incomplete .env instead of on the first invoice
+            if MISSING_ODOO_SETTINGS:
+                raise ValueError(f"Missing Odoo settings in .env: {', '.join(MISSING_ODOO_SETTINGS)}")
+            client = OdooClient(ODOO.url, ODOO.db, ODOO.api_key, max_inflight=ODOO_MAX_INFLIGHT)
+            client.connect()
+        except Exception as e:
+            error = e
+        self.root.after(0, self._on_connected, client, error)
+
+    def _on_connected(self, client, error):
+        """ Back on the main thread once the connection attempt finished """
+        self.odoo = client
+        if error:
+            self.log(f"Odoo Connection Failed", "error")
+            logging.log(logging.ERROR, f"Odoo Connection Failed: {error}")
+        else:
+            self.log("Connected to Odoo successfully.", "success")
+            logging.log(logging.INFO, f"Connected to Odoo successfully at {ODOO.url}")
+            self.log(f"URL = {ODOO.url}")
+
+        self.btn_toggle.config(state=tk.NORMAL)
         self.start_monitoring()
 
     def toggle_monitoring(self):
@@ -149,8 +318,13 @@ class App:
             self.status_label.config(text="Status: ODOO CONNECTION ERROR", fg="red")
             return
 
-        # Check if network path is reachable
-        if not os.path.exists(WATCH_FOLDER):
+        # Check if network path is reachable, wait for a fresh probe to finish
+        reachable = self._watch_reachable()
+        if reachable is None:
+            self.root.after(500, self.start_monitoring)
+            return
+
+        if not reachable:
             self.log(f"Network is down: please turn on kassa...", "error")
             self.status_label.config(text="Status: RETRYING CONNECTION", fg="orange")
             logging.log(logging.ERROR, f"Network is down: {WATCH_FOLDER}")
@@ -161,11 +335,9 @@ class App:
 
         try:
             # Clean up any stale observer before starting a new one.
-            self._stop_observer(non_blocking=True)
+            self._stop_observer()
             self.scan_existing_files()
-            self.observer = Observer() # polling observer
-            self.observer.schedule(PDFHandler(self.file_queue), WATCH_FOLDER, recursive=False)
-            self.observer.start()
+            self.observer = self._start_observer()
 
             self.is_running = True
             self.status_label.config(text="Status: RUNNING", fg="green")
@@ -178,7 +350,7 @@ class App:
     def stop_monitoring(self):
         if not self.is_running or not self.observer: return
 
-        self._stop_observer(non_blocking=False)
+        self._stop_observer()
 
         self.is_running = False
         self.status_label.config(text="Status: STOPPED", fg="red")
@@ -186,13 +358,37 @@ class App:
         self.log(">>> Monitoring STOPPED")
         logging.log(logging.INFO, "Monitoring stopped.")
 
-    def _stop_observer(self, non_blocking: bool):
+    def _start_observer(self):
+        """
+        Polls network shares (SMB/NFS drop events under bursts), uses the native
+        observer on local disks and falls back to polling if it fails to start.
+        :return: the running observer
+        """
+        handler = PDFHandler(self.enqueue_file)
+        if not is_network_path(WATCH_FOLDER):
+            try:
+                observer = Observer()
+                observer.schedule(handler, str(WATCH_FOLDER), recursive=False)
+                observer.start()
+                return observer
+            except Exception as e:
+                logging.log(logging.WARNING, f"Native observer failed, falling back to polling: {e}")
+
+        observer = PollingObserver(timeout=WATCH_POLL_INTERVAL)
+        observer.schedule(handler, str(WATCH_FOLDER), recursive=False)
+        observer.start()
+        self.log(f"Polling share every {WATCH_POLL_INTERVAL}s", "gray")
+        return observer
+
+    def _stop_observer(self):
+        """
+        Signals the observer to stop without joining it. Its thread may be inside
+        enqueue_file waiting on the Tk thread, a join here could deadlock.
+        """
         if not self.observer:
             return
         try:
             self.observer.stop()
-            if not non_blocking:
-                self.observer.join()
         except Exception as e:
             logging.log(logging.ERROR, f"Observer stop error: {e}")
         finally:
@@ -201,68 +397,165 @@ class App:
     def log(self, message, tag=None):
         """
         Thread-safe logging.
-        Uses root.after_idle to ensure the GUI update happens on the main thread.
+        Messages are buffered and written by a single throttled flush on the main thread.
         """
-        def _update():
-            self.log_area.config(state='normal')
-            timestamp = time.strftime("%H:%M:%S")
-            self.log_area.insert(tk.END, f"[{timestamp}] {message}\n", tag)
-            self.log_area.see(tk.END)
-            self.log_area.config(state='disabled')
+        timestamp = time.strftime("%H:%M:%S")
+        with self._pending_logs_lock:
+            self._pending_logs.append((f"[{timestamp}] {message}\n", tag))
+            if self._log_flush_scheduled:
+                return
+            self._log_flush_scheduled = True
+        self.root.after(LOG_FLUSH_TIME, self._flush_logs)
 
-        self.root.after_idle(_update)
+    def _flush_logs(self):
+        """ Writes all buffered messages in one pass and trims the oldest lines """
+        with self._pending_logs_lock:
+            pending, self._pending_logs = self._pending_logs, []
+            self._log_flush_scheduled = False
+
+        # One Tk insert call for the whole batch, untagged lines get an empty tag list
+        insert_args = []
+        for line, tag in pending:
+            insert_args.extend((line, tag or ()))
+
+        self.log_area.config(state='normal')
+        self.log_area.insert(tk.END, *insert_args)
+
+        # Track the line count ourselves instead of asking Tk for the index
+        self._log_lines += sum(line.count("\n") for line, _ in pending)
+        if self._log_lines > LOG_MAX_LINES:
+            self.log_area.delete("1.0", f"{self._log_lines - LOG_KEEP_LINES + 1}.0")
+            self._log_lines = LOG_KEEP_LINES
+
+        self.log_area.see(tk.END)
+        self.log_area.config(state='disabled')
+
+    def enqueue_file(self, file_path):
+        """
+        Thread-safe enqueue, skips files that are already queued or in progress.
+        :param file_path: path of the detected invoice
+        :return: whether the file was added to the queue
+        """
+        with self.enqueued_lock:
+            if file_path in self.enqueued:
+                return False
+            self.enqueued.add(file_path)
+        with self.file_queue_lock:
+            self.file_queue.append(file_path)
+        # event_generate is safe to call from the watchdog thread
+        self.root.event_generate(NEW_INVOICE_EVENT, when="tail")
+        return True
 
     def scan_existing_files(self):
         self.log("Scanning for existing PDF files...")
         logging.log(logging.INFO, "Scanning for existing PDF files...")
-        # 1. Take a snapshot of what is ALREADY waiting in the queue
-        current_queue = list(self.file_queue.queue)
 
-        for filename in os.listdir(WATCH_FOLDER):
-            if filename.lower().endswith(".pdf"):
-                full_path = os.path.join(WATCH_FOLDER, filename)
+        # scandir returns the entries with cached type info in one listing
+        with os.scandir(WATCH_FOLDER) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False) and is_pdf(entry.name):
+                    self.enqueue_file(entry.path)
+
+    def _watch_reachable(self):
+        """
+        Cached reachability of the watch folder. A stale entry triggers a new probe.
+        :return: reachability (bool) of the last probe within REACHABILITY_TTL, None while probing
+        """
+        ts, ok = self._reach_cache
+        if time.monotonic() - ts < REACHABILITY_TTL:
+            return ok
+        self._request_probe()
+        return None
+
+    def _request_probe(self):
+        """
+        Probes the watch folder on its own thread, the SMB round-trip never blocks
+        the GUI and a hung share never takes a slot of the invoice pool.
+        """
+        if self._reach_probing:
+            return
+        self._reach_probing = True
+        threading.Thread(target=self._probe_watch_folder, name="reachability", daemon=True).start()
+
+    def _probe_watch_folder(self):
+        """ Runs in the probe thread, the result is handled on the main thread """
+        ok = os.path.exists(WATCH_FOLDER)
+
+        def _update():
+            self._reach_cache = (time.monotonic(), ok)
+            self._reach_probing = False
+            self._on_reachability(ok)
+
+        self.root.after_idle(_update)
+
+    def _on_reachability(self, ok):
+        """ Acts on a fresh probe result, runs on the main thread """
+        if not self.is_running:
+            return
+
+        # Connection Monitor
+        if not ok:
+            self.log("Network connection lost! Retrying in 10s...", "error")
+            self._stop_observer()
+            self.is_running = False
+            self.root.after(10000, self.start_monitoring)
+            return
 
-                # 2. Only add the file if it isn't already in the list
-                if full_path not in current_queue:
-                    self.file_queue.put(full_path)
+        # Manual scan every 30 minutes in case Watchdog failed
+        current_time = time.monotonic()
+        if current_time - self.last_scan > (60 * 30):
+            self.log(">>> Running periodic scan...", "gray")
+            logging.log(logging.INFO, "Running periodic scan of unwatched files...")
+            self.pool.submit(self._background_scan)
+            self.last_scan = current_time
+
+    def _drain_queue(self, event=None):
+        """ Hands every queued file to the worker pool, runs on the main thread """
+        if not self.file_queue:
+            return
+        with self.file_queue_lock:
+            file_paths = list(self.file_queue)
+            self.file_queue.clear()
+        for file_path in file_paths:
+            self.pool.submit(self.process_invoice_worker, file_path)
+
+    def _background_scan(self):
+        """ Runs in the worker pool, enqueued files reach the GUI via NEW_INVOICE_EVENT """
+        try:
+            self.scan_existing_files()
+        except OSError as e:
+            logging.log(logging.ERROR, f"Periodic scan failed: {e}")
 
     def check_queue(self):
-        """ Checks queue and periodically forces a manual scan as a safety net """
+        """
+        Probes the share every heartbeat, _on_reachability handles a lost share
+        and the periodic manual scan as soon as the probe returns
+        """
         try:
-            current_time = time.time()
-
-            # Manual scan every 30 minutes in case Watchdog failed
-            if current_time - self.last_scan > (60 * 30):
-                if self.is_running and os.path.exists(WATCH_FOLDER):
-                    self.log(">>> Running periodic scan...", "gray")
-                    logging.log(logging.INFO, "Running periodic scan of unwatched files...")
-                    self.scan_existing_files()
-                self.last_scan = current_time
-
-            # Connection Monitor
-            if self.is_running and not os.path.exists(WATCH_FOLDER):
-                self.log("Network connection lost! Retrying in 10s...", "error")
-                self._stop_observer(non_blocking=True)
-                self.is_running = False
-                self.root.after(10000, self.start_monitoring)
-                return
+            if self.is_running:
+                self._request_probe()
 
-            # Process Queue
-            try:
-                if not self.queue_busy:
-                    file_path = self.file_queue.get_nowait()
-                    threading.Thread(target=self.process_invoice_worker, args=(file_path,), daemon=True).start()
-            except queue.Empty:
-                pass
+            # Safety net in case an event was missed
+            self._drain_queue()
         finally:
-            self.root.after(QUEUE_CHECKER_TIME, self.check_queue)
+            self.root.after(HEARTBEAT_TIME, self.check_queue)
+
+    def remember_processed(self, fingerprint, record):
+        """ Adds an invoice to the fingerprint cache and appends it to the cache file """
+        with self.processed_lock:
+            self.processed[fingerprint] = record
+            try:
+                append_processed_record(fingerprint, record)
+            except OSError as e:
+                logging.log(logging.ERROR, f"Could not save processed invoice cache: {e}")
 
     def process_invoice_worker(self, file_path):
         """ This runs in a background thread """
         filename = os.path.basename(file_path)
+        # Path of the copy being worked on, the share file until it is staged
+        local_path = file_path
 
         try:
-            self.queue_busy = True
             self.log(f"Detected: {filename} - Waiting for file ready...")
             logging.info( f"Detected: {filename} - Waiting for file ready.")
 
@@ -272,17 +565,40 @@ class App:
                 move_file(file_path, ERROR_FOLDER, filename)  # Move aside so we don't retry forever
                 return
 
+            # Pull the PDF off the share once, everything after reads the local copy
+            local_path = stage_file(file_path)
+
+            # Same PDF seen before -> skip parsing and Odoo entirely
+            fingerprint = file_fingerprint(local_path)
+            with self.processed_lock:
+                cached = self.processed.get(fingerprint)
+            if cached:
+                self.log(f"Invoice {cached['invoice_number']} already processed", "error")
+                logging.info(f"Skipped {filename}: same file as invoice {cached['invoice_number']} "
+                             f"(Odoo id {cached['invoice_id']}), "
+                             f"remove its line from {PROCESSED_CACHE} to import it again")
+                archive_file(file_path, local_path, ERROR_FOLDER, filename)
+                return
+
             self.log(f"Processing: {filename}...")
 
-            # Create invoice
-            invoice_id, partner_email, new_filename, invoice_number, invoice_date = self.odoo.create_post_invoice(file_path)
+            # Create invoice, the client holds an ODOO_MAX_INFLIGHT slot per request only, not while parsing
+            invoice_id, partner_email, new_filename, invoice_number, invoice_date = self.odoo.create_post_invoice(local_path)
 
             if not invoice_id:
                 self.log(f"Invoice {invoice_number} already exists", "error")
-                move_file(file_path, ERROR_FOLDER, filename)
+                archive_file(file_path, local_path, ERROR_FOLDER, filename)
                 return
             self.log(f"Invoice {invoice_number} created & posted", "success")
 
+            # Only invoices created here are remembered, a duplicate deleted in Odoo can be imported again
+            self.remember_processed(fingerprint, {
+                "invoice_id": invoice_id,
+                "invoice_number": invoice_number,
+                "invoice_date": invoice_date,
+                "filename": new_filename,
+            })
+
             # Send peppol
             success, peppol_message = self.odoo.send_peppol(invoice_id)
             dest_folder = SENT_FOLDER if success else POSTED_FOLDER
@@ -295,42 +611,141 @@ class App:
                 self.log("No email on record for partner, email not sent", "error")
             else:
                 try:
-                    email_success, send_msg = send_invoice(partner_email, invoice_number, invoice_date, file_path)
+                    email_success, send_msg = send_invoice(partner_email, invoice_number, invoice_date, local_path)
                 except Exception as e:
                     email_success, send_msg = False, f"Email send failed: {e}"
 
                 self.log(f"{send_msg}", "success" if email_success else "error")
                 logging.log(logging.INFO if email_success else logging.ERROR, f"{send_msg}")
 
-            move_file(file_path, dest_folder, new_filename)
+            archive_file(file_path, local_path, dest_folder, new_filename)
 
         except Exception as e:
             self.log(f"Error processing {filename}: Manual intervention required", "error")
             logging.error(f" exception error {filename}: {str(e)}")
-            move_file(file_path, ERROR_FOLDER, filename)
+            archive_file(file_path, local_path, ERROR_FOLDER, filename)
         finally:
-            self.queue_busy = False
+            with self.enqueued_lock:
+                self.enqueued.discard(file_path)
 
 
 # --- UTILS ---
 
-def move_file(src_path, dest_folder, new_filename):
-    """ Moves file with collision handling """
-    if not os.path.exists(src_path): return  # File might have moved already
+def file_fingerprint(file_path):
+    """
+    BLAKE2 fingerprint of a file. Large files only hash the head, the tail
+    (where the PDF xref/trailer lives) and the size.
+    :param file_path: file path
+    :return: hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    size = os.stat(file_path).st_size
+    with open(file_path, "rb") as f:
+        if size <= FINGERPRINT_FULL_LIMIT:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(FINGERPRINT_CHUNK))
+            f.seek(-FINGERPRINT_CHUNK, os.SEEK_END)
+            digest.update(f.read(FINGERPRINT_CHUNK))
+            digest.update(str(size).encode())
+    return digest.hexdigest()
 
-    if not os.path.exists(dest_folder): os.makedirs(dest_folder)
-    dest_path = os.path.join(dest_folder, new_filename)
+def load_processed_cache():
+    """
+    Loads the fingerprint cache and compacts it to one line per fingerprint,
+    later lines win and a line cut short by a crash is skipped. An unreadable cache starts empty
+    """
+    processed = {}
+    try:
+        with open(PROCESSED_CACHE, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    processed[record.pop("fingerprint")] = record
+                except (ValueError, KeyError, AttributeError):
+                    continue
+    except FileNotFoundError:
+        return {}
+    except OSError as e:
+        logging.log(logging.ERROR, f"Could not load processed invoice cache: {e}")
+        return {}
 
+    try:
+        compact_processed_cache(processed)
+    except OSError as e:
+        logging.log(logging.ERROR, f"Could not compact processed invoice cache: {e}")
+    return processed
+
+def append_processed_record(fingerprint, record):
+    """ Appends one record, a write costs the same however large the cache is """
+    with open(PROCESSED_CACHE, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"fingerprint": fingerprint, **record}) + "\n")
+
+def compact_processed_cache(processed):
+    """ Rewrites the fingerprint cache atomically, one line per fingerprint """
+    tmp_path = PROCESSED_CACHE.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for fingerprint, record in processed.items():
+            f.write(json.dumps({"fingerprint": fingerprint, **record}) + "\n")
+    os.replace(tmp_path, PROCESSED_CACHE)
+
+def stage_file(src_path):
+    """
+    Copies a file from the share into the local staging folder
+    :param src_path: path of the file on the share
+    :return: path of the local copy
+    """
+    staged_path = STAGING_FOLDER / os.path.basename(src_path)
+    shutil.copyfile(src_path, staged_path)
+    return str(staged_path)
+
+def archive_file(src_path, local_path, dest_folder, new_filename):
+    """ Moves the processed copy to dest_folder, the share original is only deleted once it is archived """
+    if not move_file(local_path, dest_folder, new_filename) or local_path == src_path:
+        return
+    try:
+        os.remove(src_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.log(logging.ERROR, f"Could not remove {src_path} from share: {e}")
+
+def move_file(src_path, dest_folder, new_filename):
+    """ Moves file with collision handling, returns whether the file was moved """
+    if not os.path.exists(src_path): return False  # File might have moved already
+
+    # List the destination once and resolve collisions in memory,
+    # only names sharing the base can collide
     base, ext = os.path.splitext(new_filename)
-    counter = 1
-    while os.path.exists(dest_path):
-        dest_path = os.path.join(dest_folder, f"{base}_{counter}{ext}")
-        counter += 1
+    try:
+        with os.scandir(dest_folder) as it:
+            existing = {entry.name for entry in it if entry.name.startswith(base)}
+    except FileNotFoundError:
+        os.makedirs(dest_folder, exist_ok=True)
+        existing = set()
+
+    candidate = new_filename
+    if candidate in existing:
+        counter = 1
+        candidate = f"{base}_{counter}{ext}"
+        while candidate in existing:
+            counter += 1
+            candidate = f"{base}_{counter}{ext}"
+
+    dest_path = Path(dest_folder) / candidate
+    try:
+        # Plain rename on the same volume, shutil copies across volumes
+        os.replace(src_path, dest_path)
+        return True
+    except OSError:
+        pass
 
     try:
         shutil.move(src_path, dest_path)
+        return True
     except Exception as e:
         logging.log(logging.ERROR, f"{e}")
+        return False
 
 
 if __name__ == "__main__":
@@ -342,8 +757,10 @@ if __name__ == "__main__":
         if messagebox.askokcancel("Quit", "DO NOT CLOSE"):
             try:
                 app.stop_monitoring()
+                app.pool.shutdown(wait=False, cancel_futures=True)
             except Exception as e:
                 logging.log(logging.ERROR, f"Error during shutdown: {e}")
+            log_listener.stop()
             root.destroy()
             sys.exit(0)
         else:
@@ -1,4 +1,7 @@
+import atexit
+import mmap
 import smtplib
+import threading
 from email.message import EmailMessage
 from pathlib import Path
 import os
@@ -9,9 +12,66 @@ load_dotenv(".env")
 SMTP_SERVER = "smtp.gmail.com"
 SMTP_PORT = 465
 
+class Mailer:
+    """
+    Keeps one authenticated SMTP connection open across invoices.
+    The connection is checked with NOOP before each send and re-opened when the server dropped it.
+    """
+    def __init__(self, server: str = SMTP_SERVER, port: int = SMTP_PORT, timeout: int = 15):
+        self.server = server
+        self.port = port
+        self.timeout = timeout
+        self._smtp = None
+        # smtplib connections are not thread-safe, workers send one at a time
+        self._lock = threading.Lock()
+
+    def _connection(self) -> smtplib.SMTP_SSL:
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close()
+
+        smtp = smtplib.SMTP_SSL(self.server, self.port, timeout=self.timeout)
+        try:
+            smtp.login(os.getenv("EMAIL"), os.getenv("APP_PASSWORD"))
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        return smtp
+
+    def send(self, msg: EmailMessage) -> dict:
+        """
+        Sends a message over the pooled connection
+        :return: refused recipients
+        """
+        with self._lock:
+            smtp = self._connection()
+            try:
+                return smtp.send_message(msg)
+            except (smtplib.SMTPServerDisconnected, OSError):
+                self.close()
+                raise
+
+    def close(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        finally:
+            self._smtp = None
+
+
+mailer = Mailer()
+atexit.register(mailer.close)
+
 def send_invoice(to_email: str, invoice_num: str, invoice_date: str, pdf_path: str) -> tuple[bool, str]:
     EMAIL = os.getenv("EMAIL")
-    APP_PASSWORD = os.getenv("APP_PASSWORD")
 
     msg = EmailMessage()
     msg["From"] = EMAIL
@@ -31,21 +91,20 @@ def send_invoice(to_email: str, invoice_num: str, invoice_date: str, pdf_path: s
     msg.set_content(body)
 
     pdf_path = Path(pdf_path)
-    with open(pdf_path, "rb") as f:
+    # Map the PDF instead of reading it into a bytes copy, the encoder reads straight from the mapping
+    with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as data:
         msg.add_attachment(
-            f.read(),
+            data,
             maintype="application",
             subtype="pdf",
             filename=pdf_path.name
         )
 
     try:
-        with smtplib.SMTP_SSL(SMTP_SERVER, SMTP_PORT, timeout=15) as smtp:
-            smtp.login(EMAIL, APP_PASSWORD)
-            refused = smtp.send_message(msg)
-            if refused:
-                return False, f"Recipient refused: {refused}"
-            return True, f"Invoice sent via email to {to_email}"
+        refused = mailer.send(msg)
+        if refused:
+            return False, f"Recipient refused: {refused}"
+        return True, f"Invoice sent via email to {to_email}"
     except smtplib.SMTPRecipientsRefused as e:
         return False, f"Recipient refused: {e.recipients}"
     except smtplib.SMTPAuthenticationError:
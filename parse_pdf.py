@@ -1,187 +1,239 @@
 import pdfplumber
 import re
-from typing import Any
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+# Patterns compiled once at import
+_INV_RE = re.compile(r"Faktuur\s+(\d+)")
+# Day, month and year captured separately
+_DATE_RE = re.compile(r"Datum\s+(\d{2})-(\d{2})-(\d{4})")
+# Buyer info identifiers
+_VAT_RE = re.compile(r"BE\s?[\d.]{10,14}", re.IGNORECASE)
+_PHONE_RE = re.compile(r"(?:Tel|Mobile|GSM|Telefoon|Phone)[\s.:]*(?P<num>[\d.\s/-]{8,})", re.IGNORECASE)
+_EMAIL_RE = re.compile(r"([A-Za-z0-9._%+-]+)\s*@\s*([A-Za-z0-9.-]+)\s*\.\s*([A-Za-z]{2,})", re.IGNORECASE)
+_ZIP_CITY_RE = re.compile(r"^(?P<zip>\d{4})\s+(?P<city>.+)$")
+# Basis, BTW and Totaal footer lines in a single pass
+# Ex: "Basis 1.379,06 €", "Btw 6% op 1.249,06 € 74,94 €", "Totaal 1.481,30 €"
+_TOTALS_RE = re.compile(
+    r"(?P<label>Basis|Totaal)\s+(?P<amount>[\d.,]+)\s*€"
+    r"|Btw (?P<rate>0|6|21)% op (?P<base>[\d.,]+)\s*€\s+[\d.,]+\s*€"
+)
+_TOTAL_KEYS = {"Basis": "basis", "Totaal": "total", "0": "btw_0", "6": "btw_6", "21": "btw_21"}
+_TOTALS_DEFAULTS = {"basis": 0.0, "btw_0": 0.0, "btw_6": 0.0, "btw_21": 0.0, "total": 0.0}
+
+# Pattern: Qty -> Description -> Total Bedrag -> Unit Prijs
+# Ex: "2 Duck Roasted Boneless 650g, 15,00 € 7,50 €"
+# Runs over the whole page text, [^\S\n] keeps every match within one line
+_ITEM_RE = re.compile(
+    r"^[^\S\n]*\"?(?P<qty>\d+)\"?[^\S\n]+"  # Qty
+    r"\"?(?P<desc>.+?)\"?[^\S\n]+"  # Description (non-greedy)
+    r"(?P<total>[\d.,]+[^\S\n]*€)[^\S\n]+"  # Total amount
+    r"(?P<unit>[\d.,]+[^\S\n]*€)",  # Unit price
+    re.MULTILINE,
+)
+
+# Deletes spaces and dots from VAT numbers
+_VAT_TABLE = str.maketrans("", "", " .")
+# Deletes currency symbol, spaces and thousands separator (dot) in one pass
+_EU_TABLE = str.maketrans("", "", "€ .")
+
+class _AlnumTable(dict):
+    """str.translate table that deletes every non-alphanumeric character, filled per code point on first use."""
+    def __missing__(self, code_point: int):
+        value = code_point if chr(code_point).isalnum() else None
+        self[code_point] = value
+        return value
+
+_ALNUM_TABLE = _AlnumTable()
+
+@dataclass(slots=True)
+class BuyerInfo:
+    """Buyer details read from the top right box of the first page."""
+    name: Optional[str] = None
+    street: Optional[str] = None
+    zip: Optional[str] = None
+    city: Optional[str] = None
+    phone: Optional[str] = None
+    vat: Optional[str] = None
+    email: Optional[str] = None
 
 def parse_eu_float(val: str) -> float:
     """Safely converts European formatted strings (1.234,56) to floats."""
     if not val:
         return 0.0
-    # Remove currency symbols and spaces
-    clean_val = val.replace("€", "").strip()
-    # Remove thousands separator (dot) and replace decimal (comma) with dot
-    clean_val = clean_val.replace(".", "").replace(",", ".")
+    # Strip currency, spaces and thousands separator, replace decimal (comma) with dot
+    clean_val = val.translate(_EU_TABLE).replace(",", ".")
     try:
         return float(clean_val)
     except ValueError:
         return 0.0
 
 def extract_invoice_metadata(text: str) -> dict:
-    """Uses regex to find standard Belgian invoice headers."""
+    """Uses regex to find standard Belgian invoice headers, the date is returned as a datetime.date."""
     # Matches 'Factuur 7216'
-    inv_match = re.search(r"Faktuur\s+(\d+)", text)
+    inv_match = _INV_RE.search(text)
     # Matches 'Datum 19-12-2025'
-    date_match = re.search(r"Datum\s+(\d{2}-\d{2}-\d{4})", text)
-    new_date_str = None
+    date_match = _DATE_RE.search(text)
+    invoice_date = None
     if date_match:
-        date = date_match.group(1)
-        dd, mm, yyyy = date.split("-")
-        new_date_str = f"{yyyy}-{mm}-{dd}"
+        dd, mm, yyyy = date_match.groups()
+        try:
+            invoice_date = date(int(yyyy), int(mm), int(dd))
+        except ValueError:
+            # Impossible calendar date, treat as missing
+            pass
 
     return {
         "invoice_number": inv_match.group(1) if inv_match else None,
-        "invoice_date": new_date_str if date_match else None,
+        "invoice_date": invoice_date,
     }
 
-def extract_buyer_info(page) -> dict[str, Any]:
-    """Extracts buyer details by finding the postal code anchor."""
-    width, height = page.width, page.height
-    # Focus on the top right quadrant where buyer info resides
-    right_box = (width * 0.45, 0, width, height * 0.4)
-    text = page.crop(right_box).extract_text() or ""
-
+def extract_buyer_info(text: str) -> BuyerInfo:
+    """Extracts buyer details from the buyer box text by finding the postal code anchor."""
     lines = [line.strip() for line in text.splitlines() if line.strip()]
-    info = {"name": None, "street": None, "zip": None, "city": None, "phone": None, "vat": None, "email": None}
-
-    # 1. Regex patterns for specific identifiers
-    vat_pattern = re.compile(r"BE\s?[\d.]{10,14}", re.IGNORECASE)
-    phone_pattern = re.compile(r"(?:Tel|Mobile|GSM|Telefoon|Phone)[\s.:]*(?P<num>[\d.\s/-]{8,})", re.IGNORECASE)
-    email_pattern = re.compile(r"([A-Za-z0-9._%+-]+)\s*@\s*([A-Za-z0-9.-]+)\s*\.\s*([A-Za-z]{2,})", re.IGNORECASE)
-    zip_city_pattern = re.compile(r"^(?P<zip>\d{4})\s+(?P<city>.+)$")
+    info = BuyerInfo()
 
+    # The first match of each field wins, a field that is already filled is not searched again
     for i, line in enumerate(lines):
         # Match VAT
-        vat_match = vat_pattern.search(line)
-        phone_match = phone_pattern.search(line)
-        email_match = email_pattern.search(line)
-        if vat_match:
-            info["vat"] = vat_match.group(0).replace(" ", "").replace(".", "")
-            continue
-
-        if phone_match:
-            info["phone"] = phone_match.group("num").strip()
-            continue
-
-        if email_match:
-            info["email"] = email_match.group(0)
-            continue
-
+        if info.vat is None and (vat_match := _VAT_RE.search(line)):
+            info.vat = vat_match.group(0).translate(_VAT_TABLE)
+        elif info.phone is None and (phone_match := _PHONE_RE.search(line)):
+            info.phone = phone_match.group("num").strip()
+        elif info.email is None and (email_match := _EMAIL_RE.search(line)):
+            info.email = email_match.group(0)
         # Match Address Anchor (e.g., 9200 DENDERMONDE)
-        zip_match = zip_city_pattern.match(line)
-        if zip_match:
-            info["zip"] = zip_match.group("zip")
-            info["city"] = zip_match.group("city")
+        elif info.zip is None and (zip_match := _ZIP_CITY_RE.match(line)):
+            info.zip = zip_match.group("zip")
+            info.city = zip_match.group("city")
             # Logic: Street is 1 line above, Name is 2 lines above
-            if i - 1 >= 0: info["street"] = lines[i - 1]
-            if i - 2 >= 0: info["name"] = lines[i - 2]
+            if i - 1 >= 0: info.street = lines[i - 1]
+            if i - 2 >= 0: info.name = lines[i - 2]
+
+        # Name and street come with the zip anchor, nothing left to find
+        if info.vat and info.phone and info.email and info.zip:
+            break
 
     return info
 
-def extract_items(page) -> list[dict]:
+def extract_items(text: str) -> list[dict]:
     """Extracts line items using a non-greedy regex to handle mid-line descriptions."""
-    text = page.extract_text()
-    lines = text.splitlines()
     items = []
 
-    # Pattern: Qty -> Description -> Total Bedrag -> Unit Prijs
-    # Ex: "2 Duck Roasted Boneless 650g, 15,00 € 7,50 €"
-    item_pattern = re.compile(
-        r"^\s*\"?(?P<qty>\d+)\"?\s+"  # Qty
-        r"\"?(?P<desc>.+?)\"?\s+"  # Description (non-greedy)
-        r"(?P<total>[\d.,]+\s*€)\s+"  # Total amount
-        r"(?P<unit>[\d.,]+\s*€)"  # Unit price
-    )
-
-    for line in lines:
-        match = item_pattern.search(line)
-        if match:
-            items.append({
-                "quantity": int(match.group("qty")),
-                "description": match.group("desc").strip(", "),
-                "unit_price": parse_eu_float(match.group("unit")),
-                "total": parse_eu_float(match.group("total"))
-            })
+    # One pass over the page instead of a search per line
+    for match in _ITEM_RE.finditer(text):
+        items.append({
+            "quantity": int(match.group("qty")),
+            "description": match.group("desc").strip(", "),
+            "unit_price": parse_eu_float(match.group("unit")),
+            "total": parse_eu_float(match.group("total"))
+        })
 
     return items
 
 def extract_totals(text: str) -> dict[str, float]:
     """Extracts summary totals (Basis, BTW, Totaal) from the footer table."""
-    totals = {
-        "basis": 0.0,
-        "btw_0": 0.0,
-        "btw_6": 0.0,
-        "btw_21": 0.0,
-        "total": 0.0
-    }
+    totals = _TOTALS_DEFAULTS.copy()
 
-    # Extract Basis
-    basis_match = re.search(r"Basis\s+([\d.,]+)\s*€", text)
-    if basis_match:
-        totals["basis"] = parse_eu_float(basis_match.group(1))
-
-    # Extract BTW 0%
-    btw0_match = re.search(r"Btw 0% op ([\d.,]+)\s*€\s+([\d.,]+)\s*€", text)
-    if btw0_match:
-        totals["btw_0"] = parse_eu_float(btw0_match.group(1))
-
-    # Extract BTW 6%
-    btw6_match = re.search(r"Btw 6% op ([\d.,]+)\s*€\s+([\d.,]+)\s*€", text)
-    if btw6_match:
-        totals["btw_6"] = parse_eu_float(btw6_match.group(1))
-
-    # Extract BTW 21%
-    btw21_match = re.search(r"Btw 21% op ([\d.,]+)\s*€\s+([\d.,]+)\s*€", text)
-    if btw21_match:
-        totals["btw_21"] = parse_eu_float(btw21_match.group(1))
-
-    # Extract Total
-    total_match = re.search(r"Totaal\s+([\d.,]+)\s*€", text)
-    if total_match:
-        totals["total"] = parse_eu_float(total_match.group(1))
+    # BTW lines report the taxable base amount
+    # Reversed so the first occurrence of each total is written last and wins
+    totals.update({
+        _TOTAL_KEYS[match["label"] or match["rate"]]: parse_eu_float(match["amount"] or match["base"])
+        for match in reversed(list(_TOTALS_RE.finditer(text)))
+    })
 
     return totals
 
-def parse_invoice(pdf_path: str) -> dict:
-    items_all = []
-    full_text_all = ""
-
-    with pdfplumber.open(pdf_path) as pdf:
+def parse_header(pdf_path: str) -> dict:
+    """
+    Parses the first page only.
+    :param pdf_path: path of the invoice
+    :return: dict with metadata, buyer and the first page text for parse_body
+    """
+    # Only text is taken out of the PDF, all regex work runs after it is closed
+    with pdfplumber.open(pdf_path, pages=[1]) as pdf:
         if not pdf.pages:
             raise ValueError("PDF contains no pages.")
-        for i, page in enumerate(pdf.pages):
-            text = page.extract_text()
-            if not text:
-                continue
-            full_text_all += text + "\n"
 
-            # Extract items from every page
-            items_all.extend(extract_items(page))
+        first_page = pdf.pages[0]
+        first_text = first_page.extract_text() or ""
+        # Focus on the top right quadrant where buyer info resides
+        width, height = first_page.width, first_page.height
+        buyer_text = first_page.crop((width * 0.45, 0, width, height * 0.4)).extract_text() or ""
+        first_page.close()
+
+    return {
+        "metadata": extract_invoice_metadata(first_text),
+        "buyer": extract_buyer_info(buyer_text),
+        "text": first_text
+    }
 
-        # Metadata and buyer info from first page only
-        metadata = extract_invoice_metadata(pdf.pages[0].extract_text() or "")
-        buyer = extract_buyer_info(pdf.pages[0])
+def parse_body(pdf_path: str, first_text: str) -> dict:
+    """
+    Parses the items and totals, the first page is not read again.
+    :param pdf_path: path of the invoice
+    :param first_text: first page text from parse_header
+    :return: dict with items and totals
+    """
+    texts = [first_text]
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages[1:]:
+            texts.append(page.extract_text() or "")
+            # Free the parsed page objects, only the text is needed from here on
+            page.close()
 
+    texts = [text for text in texts if text]
+
+    return {
+        "items": [item for text in texts for item in extract_items(text)],
         # Totals from all text
-        totals = extract_totals(full_text_all)
+        "totals": extract_totals("\n".join(texts))
+    }
 
+PARSE_MODES = ("full", "metadata")
+
+def parse_invoice(pdf_path: str, mode: str = "full") -> dict:
+    """
+    Parses an invoice PDF.
+    :param pdf_path: path of the invoice
+    :param mode: "full" parses every page, "metadata" only loads the first page
+                 for metadata and buyer info and returns no items or totals
+    :return: dict with metadata, buyer, items and totals
+    """
+    if mode not in PARSE_MODES:
+        raise ValueError(f"Unknown parse mode '{mode}', expected one of {PARSE_MODES}.")
+
+    header = parse_header(pdf_path)
+    if mode == "metadata":
+        return {
+            "metadata": header["metadata"],
+            "buyer": header["buyer"],
+            "items": [],
+            "totals": {}
+        }
+
+    body = parse_body(pdf_path, header["text"])
     return {
-        "metadata": metadata,
-        "buyer": buyer,
-        "items": items_all,
-        "totals": totals
+        "metadata": header["metadata"],
+        "buyer": header["buyer"],
+        "items": body["items"],
+        "totals": body["totals"]
     }
 
-def generate_filename(metadata: dict, buyer: dict) -> str:
+def generate_filename(metadata: dict, buyer: BuyerInfo) -> str:
     """
     Creates a safe filename: Company_YYYYMMDD_InvNum.pdf
     """
     # Clean company name
-    buyer_name = buyer.get("name") or "UnknownCompany"
-    safe_company = "".join([c for c in buyer_name if c.isalnum() or c == " "]).strip().replace(" ", "")
+    buyer_name = buyer.name or "UnknownCompany"
+    safe_company = buyer_name.translate(_ALNUM_TABLE)
     if not safe_company:
         safe_company = "UnknownCompany"
 
-    # Clean date (Remove separators like / - .)
-    safe_date = re.sub(r"[-./]", "", metadata.get("invoice_date") or "UnknownDate")
+    # Date without separators: YYYYMMDD
+    invoice_date = metadata.get("invoice_date")
+    safe_date = f"{invoice_date:%Y%m%d}" if invoice_date else "UnknownDate"
     invoice_number = metadata.get("invoice_number") or "UnknownNumber"
 
     return f"{safe_company}_{safe_date}_{invoice_number}.pdf"
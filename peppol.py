@@ -1,18 +1,74 @@
 import base64
+import hashlib
+import mmap
 import os
+import socket
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+import orjson
 import requests
-from typing import Any
-from parse_pdf import parse_invoice, generate_filename
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+from typing import Any, Optional
+from parse_pdf import BuyerInfo, parse_header, parse_body, generate_filename
+
+# Bytes of an error response kept in the exception message
+ERROR_BODY_LIMIT = 2048
+
+# Read-only methods are retried on a dropped connection, a read timeout and these statuses, with exponential backoff
+READ_RETRIES = 3
+READ_RETRY_BACKOFF = 0.5
+_READ_METHODS = frozenset({"search", "search_read", "search_count", "read", "web_read", "context_get"})
+_RETRY_STATUSES = frozenset({502, 503, 504})
+
+# Master data ids are kept on disk between runs, one file per Odoo url and database
+ID_CACHE_DIR = Path.home() / ".cache" / "peppol"
+ID_CACHE_TTL = 24 * 60 * 60
+# Odoo model behind each kind of cached id
+_CACHE_MODELS = {
+    "account": "account.account",
+    "tax": "account.tax",
+    "journal": "account.journal",
+    "country": "res.country",
+}
+
+# Invoice line per VAT rate: (totals key, rate, label)
+_TAX_MAP = (
+    ("btw_0", 0.0, "Vrijgesteld"),
+    ("btw_6", 6.0, "Voeding en levensmiddelen"),
+    ("btw_21", 21.0, "Divers/non-food"),
+)
+
+def _is_connect_error(error: requests.RequestException) -> bool:
+    """ True when no connection was made, the request never reached Odoo """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
 
 class OdooClientError(Exception):
     pass
 
+class _KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose sockets send TCP keepalives on top of urllib3's TCP_NODELAY,
+    idle pooled connections are kept open instead of being dropped silently by NAT or firewalls.
+    """
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        super().init_poolmanager(*args, **kwargs)
+
 class OdooClient:
     """
     Client that connect to the Odoo database via the external JSON-2 API.
     JSON-2
     """
-    def __init__(self, url: str, db: str, api_key: str, timeout: int = 15):
+    def __init__(self, url: str, db: str, api_key: str, timeout: int = 15, max_inflight: Optional[int] = None):
         self.base_url = f"{url}/json/2"
         self.db = db
         self.api_key = api_key
@@ -24,43 +80,119 @@ class OdooClient:
             "Content-Type": "application/json",
         }
 
+        # One keep-alive session shared by all worker threads
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Retry only covers failed connects, nothing reached the server yet so any call can be resent.
+        # Dropped connections, read timeouts and gateway statuses are retried by _call for reads only
+        retries = Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.3)
+        # pool_maxsize covers a create_post_invoices batch plus its concurrent lookups
+        self.session.mount("https://", _KeepAliveAdapter(pool_connections=8, pool_maxsize=16, max_retries=retries))
+        self.session.mount("http://", _KeepAliveAdapter(pool_connections=8, pool_maxsize=16, max_retries=retries))
+
+        # Caps the requests in flight to Odoo across all threads, None leaves them unbounded
+        self._inflight = threading.BoundedSemaphore(max_inflight) if max_inflight else nullcontext()
+
+        # Runs independent lookups of one invoice concurrently over the session pool
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="odoo")
+
+        # Locks per (kind, key) for check-then-create sequences shared by the worker threads
+        self._key_locks = {}
+        self._key_locks_lock = threading.Lock()
+
+        # Set once connect() validated the API key
+        self._connected = False
+
+        # Master data ids keyed by (lookup, argument), they do not change between invoices
+        self._cache_path = ID_CACHE_DIR / f"{hashlib.sha256(f'{url}|{db}'.encode()).hexdigest()[:16]}.json"
+        self._cache_lock = threading.Lock()
+        self._cache_time, self._cache = self._load_id_cache()
+
+    def close(self):
+        """ Closes the lookup threads and the pooled connections """
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def _call(self, model: str, method: str, payload: dict) -> Any:
-        try:
-            res = requests.post(
-                f"{self.base_url}/{model}/{method}",
-                headers=self.headers,
-                json=payload,
-                timeout=self.timeout,
-            )
-        except requests.RequestException as e:
-            raise OdooClientError(f"Connection error: {e}")
+        # Content-Type is set on the session, orjson encodes straight to bytes
+        request_body = orjson.dumps(payload)
+        # Reads are resent on a dropped connection, a read timeout or a gateway status,
+        # a write could be applied twice so it is sent once
+        attempts = 1 + (READ_RETRIES if method in _READ_METHODS else 0)
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                # Only the request itself holds a slot, never the backoff sleep
+                with self._inflight:
+                    res = self.session.post(
+                        f"{self.base_url}/{model}/{method}",
+                        data=request_body,
+                        timeout=self.timeout,
+                    )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # Failed connects were already retried by the adapter's urllib3 Retry
+                if last_attempt or _is_connect_error(e):
+                    raise OdooClientError(f"Connection error: {e}")
+            except requests.RequestException as e:
+                raise OdooClientError(f"Connection error: {e}")
+            else:
+                if res.status_code not in _RETRY_STATUSES or last_attempt:
+                    break
+            time.sleep(READ_RETRY_BACKOFF * 2 ** attempt)
 
         if res.status_code != 200:
+            # Error pages can be large HTML, only the start is decoded into the message
+            body = res.content[:ERROR_BODY_LIMIT].decode("utf-8", "replace")
+            if len(res.content) > ERROR_BODY_LIMIT:
+                body += f"... ({len(res.content)} bytes)"
             raise OdooClientError(
-                f"HTTP {res.status_code} {model}.{method}: {res.text}"
+                f"HTTP {res.status_code} {model}.{method}: {body}"
             )
 
-        data = res.json()
+        # Parse the raw bytes, no text decode of the body
+        data = orjson.loads(res.content)
 
         if isinstance(data, dict) and data.get("error"):
             raise OdooClientError(data["error"])
 
         return data
 
+    def _submit_calls(self, calls: list[tuple[str, str, dict]]) -> list[Future]:
+        """
+        Starts independent calls concurrently, the caller can do other work before collecting them.
+        :param calls: (model, method, payload) per call
+        :return: futures of the results in the order of calls
+        """
+        return [self._executor.submit(self._call, *call) for call in calls]
+
     def connect(self):
         """
         Validate JSON-2 API access.
         JSON-2 does NOT authenticate or return a uid.
         We verify access by calling a lightweight endpoint.
+        Repeated calls on a connected client return without a request.
         """
+        if self._connected:
+            return True
+
         user_context = self._call(
             model="res.users",
             method="context_get",
             payload={}
         )
 
-        if not user_context['uid']:
+        if not user_context.get("uid"):
             raise PermissionError("Authentication failed: Check username/API key.")
+
+        self.prefetch_master_data()
+        self._connected = True
         return True
 
 
@@ -71,6 +203,12 @@ class OdooClient:
             payload["limit"] = limit
         return self._call(model, "search", payload)
 
+    def search_read(self, model, domain, fields, limit = None):
+        payload = {"domain": domain, "fields": fields}
+        if limit:
+            payload["limit"] = limit
+        return self._call(model, "search_read", payload)
+
     def read(self, model, ids, fields):
         return self._call(model, "read", {
             "ids": ids,
@@ -88,80 +226,213 @@ class OdooClient:
         payload.update(kwargs)
         return self._call(model, method, payload)
 
+    def _cached(self, key: tuple, fetch) -> Any:
+        """
+        Returns the cached value for key, calling fetch on a miss.
+        Two threads missing at once both fetch, the ids are identical so either result may win.
+        """
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        # The lookup itself runs unlocked, only the dict write is guarded
+        value = fetch()
+        with self._cache_lock:
+            value = self._cache.setdefault(key, value)
+        self._save_id_cache()
+        return value
+
+    def _load_id_cache(self) -> tuple[float, dict]:
+        """
+        Reads the ids saved by an earlier run.
+        :return: (time the ids were first fetched, ids), empty when the file is missing, unreadable or expired
+        """
+        try:
+            with open(self._cache_path, "rb") as f:
+                saved = orjson.loads(f.read())
+            if time.time() - saved["time"] < ID_CACHE_TTL:
+                return saved["time"], {(kind, arg): value for kind, arg, value in saved["ids"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return time.time(), {}
+
+    def _save_id_cache(self):
+        """ Writes the ids atomically, a failed write only costs the lookups on the next run """
+        with self._cache_lock:
+            ids = [[kind, arg, value] for (kind, arg), value in list(self._cache.items())]
+            tmp_path = self._cache_path.with_suffix(".tmp")
+            try:
+                os.makedirs(ID_CACHE_DIR, exist_ok=True)
+                with open(tmp_path, "wb") as f:
+                    f.write(orjson.dumps({"time": self._cache_time, "ids": ids}))
+                os.replace(tmp_path, self._cache_path)
+            except OSError:
+                pass
+
+    def invalidate_cache(self):
+        """ Drops the cached master data ids, in memory and on disk, the next lookups fetch them again """
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_time = time.time()
+            try:
+                os.remove(self._cache_path)
+            except OSError:
+                pass
+
+    def _cached_ids_valid(self) -> bool:
+        """
+        Checks that every cached id still exists and is active in Odoo, one search_count per model.
+        :return: False if any cached id is gone
+        """
+        with self._cache_lock:
+            by_model = {}
+            for (kind, _), value in self._cache.items():
+                by_model.setdefault(_CACHE_MODELS[kind], set()).add(value)
+        models = list(by_model)
+        futures = self._submit_calls([
+            (model, "search_count", {"domain": [["id", "in", list(by_model[model])]]})
+            for model in models
+        ])
+        return all(future.result() == len(by_model[model]) for model, future in zip(models, futures))
+
     # Master data helpers
     def get_sales_account_id(self, code: str = "700000") -> int:
-        ids = self.search(
+        return self._cached(("account", code), lambda: self._fetch_sales_account_id(code))
+
+    def get_sale_tax_id(self, rate: float) -> int:
+        return self._cached(("tax", rate), lambda: self._fetch_sale_tax_id(rate))
+
+    def get_journal_id(self, code: str = "VF") -> int:
+        return self._cached(("journal", code), lambda: self._fetch_journal_id(code))
+
+    def get_country_id(self, code: str = "BE") -> int:
+        return self._cached(("country", code), lambda: self._fetch_country_id(code))
+
+    def prefetch_master_data(self, tax_rates: tuple = (0.0, 6.0, 21.0)):
+        """
+        Fills the master data cache before the first invoice in about one round-trip,
+        the sale taxes of every rate come back in one search_read.
+        """
+        # The four lookups are independent, they run concurrently, ids loaded from disk are not fetched again
+        futures = [
+            self._executor.submit(self.get_sales_account_id),
+            self._executor.submit(self.get_journal_id),
+            self._executor.submit(self.get_country_id),
+        ]
+        missing = [rate for rate in tax_rates if ("tax", rate) not in self._cache]
+        if missing:
+            futures.append(self._executor.submit(self._fetch_sale_tax_ids, missing))
+        for future in futures:
+            future.result()
+
+    def _fetch_sale_tax_ids(self, rates):
+        """ Caches the sale tax ids of all rates with one search_read """
+        taxes = self.search_read(
+            model="account.tax",
+            domain=[
+                ["type_tax_use", "=", "sale"],
+                ["amount", "in", list(rates)],
+                ["active", "=", True],
+            ],
+            fields=["id", "amount"],
+        )
+        # Same default order as the per-rate search, the first tax of a rate wins
+        with self._cache_lock:
+            for tax in taxes:
+                self._cache.setdefault(("tax", tax["amount"]), tax["id"])
+        self._save_id_cache()
+
+    def _fetch_sales_account_id(self, code: str) -> int:
+        rows = self.search_read(
             model="account.account",
             domain=[["code", "=", code]],
+            fields=["id"],
             limit=1,
         )
-        if not ids:
+        if not rows:
             raise ValueError(f"Sales account {code} not found in Odoo.")
-        return ids[0]
+        return rows[0]["id"]
 
-    def get_sale_tax_id(self, rate: float) -> int:
-        ids = self.search(
+    def _fetch_sale_tax_id(self, rate: float) -> int:
+        rows = self.search_read(
             model="account.tax",
             domain=[
                 ["type_tax_use", "=", "sale"],
                 ["amount", "=", rate],
                 ["active", "=", True],
             ],
+            fields=["id"],
             limit=1,
         )
-        if not ids:
+        if not rows:
             raise ValueError(f"Sales tax for rate {rate}% not found.")
-        return ids[0]
+        return rows[0]["id"]
 
-    def get_journal_id(self, code: str = "VF") -> int:
-        ids = self.search(
+    def _fetch_journal_id(self, code: str) -> int:
+        rows = self.search_read(
             model="account.journal",
             domain=[["code", "=", code]],
+            fields=["id"],
             limit=1,
         )
-        if not ids:
+        if not rows:
             raise ValueError(f"Journal '{code}' not found.")
-        return ids[0]
+        return rows[0]["id"]
 
-    def get_country_id(self, code: str = "BE") -> int:
-        ids = self.search(
+    def _fetch_country_id(self, code: str) -> int:
+        rows = self.search_read(
             model="res.country",
             domain=[["code", "=", code]],
+            fields=["id"],
             limit=1,
         )
-        if not ids:
+        if not rows:
             raise ValueError(f"Country code '{code}' not found.")
-        return ids[0]
+        return rows[0]["id"]
 
-    def get_or_create_partner(self, customer_info: dict) -> tuple[int, Any]:
-        vat = customer_info.get("vat")
+    def _key_lock(self, kind: str, key: str) -> threading.Lock:
+        """
+        Returns the lock of one invoice number or VAT, created on first use.
+        Locks are kept for the life of the client, one small object per key.
+        """
+        with self._key_locks_lock:
+            return self._key_locks.setdefault((kind, key), threading.Lock())
+
+    @staticmethod
+    def _partner_search_call(vat: str) -> tuple[str, str, dict]:
+        """ Partner search by VAT as a (model, method, payload) call, the email comes back in the same call """
+        return "res.partner", "search_read", {
+            "domain": [["vat", "=", vat]],
+            "fields": ["id", "email"],
+            "limit": 1,
+        }
+
+    def get_or_create_partner(self, customer_info: BuyerInfo) -> tuple[int, Any]:
+        vat = customer_info.vat
         if not vat:
             raise ValueError("Customer VAT number is required.")
 
-        # Search by VAT
-        ids = self.search(
-            model="res.partner",
-            domain=[["vat", "=", vat]],
-            limit=1,
-        )
-        if ids:
-            partner_id = ids[0]
-            partner_email = self.read(model="res.partner", ids=partner_id, fields=["email"])[0]["email"]
-            return partner_id, partner_email
-
+        # Two invoices of a new customer must not both miss the search and create two partners
+        with self._key_lock("partner", vat):
+            partners = self._call(*self._partner_search_call(vat))
+            if partners:
+                return partners[0]["id"], partners[0]["email"]
+            return self.create_partner(customer_info)
 
-        # Create partner
+    def create_partner(self, customer_info: BuyerInfo) -> tuple[int, Any]:
+        vat = customer_info.vat
         country_id = self.get_country_id("BE")
 
+        email = customer_info.email or False
         new_partner = self.create(
             model="res.partner",
             vals={
-                "name": customer_info["name"],
-                "street": customer_info.get("street"),
-                "city": customer_info.get("city"),
-                "zip": customer_info.get("zip"),
-                "phone": customer_info.get("phone") or False,
-                "email": customer_info.get("email") or False,
+                "name": customer_info.name,
+                "street": customer_info.street,
+                "city": customer_info.city,
+                "zip": customer_info.zip,
+                "phone": customer_info.phone or False,
+                "email": email,
                 "country_id": country_id,
                 "vat": vat,
                 "lang": "nl_BE",
@@ -171,9 +442,8 @@ class OdooClient:
             },
         )
 
-        partner_email = self.read(model="res.partner", ids=new_partner, fields=["email"])[0]["email"]
-
-        return new_partner, partner_email
+        # Odoo stores the email as sent, no need to read it back
+        return new_partner, email
 
     def create_invoice_lines(self, totals: dict) -> list:
         """
@@ -183,18 +453,15 @@ class OdooClient:
         """
         account_id = self.get_sales_account_id()  # Default 700000
 
-        lines = []
-        # Mapping: (rate, label)
-        tax_map = [
-            (0.0, 'Vrijgesteld'),
-            (6.0, 'Voeding en levensmiddelen'),
-            (21.0, 'Divers/non-food')
-        ]
+        amounts = [(rate, label, float(totals.get(key, 0))) for key, rate, label in _TAX_MAP]
 
-        for rate, label in tax_map:
-            key = f"btw_{int(rate)}"
-            amount = float(totals.get(key, 0))
+        # Fetch the taxes of every uncached rate in one call, on a warm cache this sends nothing
+        missing = [rate for rate, _, amount in amounts if amount > 0 and ("tax", rate) not in self._cache]
+        if missing:
+            self._fetch_sale_tax_ids(missing)
 
+        lines = []
+        for rate, label, amount in amounts:
             if amount > 0:
                 tax_id = self.get_sale_tax_id(rate)
                 lines.append((0, 0, {
@@ -218,64 +485,105 @@ class OdooClient:
         :return: invoice id
         """
 
-        # 1. Parse invoice and extract data
-        invoice_data = parse_invoice(file_path)
-        meta, buyer, _, totals =  invoice_data["metadata"], invoice_data["buyer"], invoice_data["items"], invoice_data["totals"]
-
-        # Get partner and journal id
-        partner_id, partner_email = self.get_or_create_partner(buyer)
-        journal_id = self.get_journal_id("VF")
+        # 1. Parse the first page, the lookups only need the invoice number and VAT
+        header = parse_header(file_path)
+        meta, buyer = header["metadata"], header["buyer"]
 
         # If no invoice number or date -> invoice invalid
         invoice_number = meta.get("invoice_number")
         invoice_date = meta.get("invoice_date")
         if not invoice_number or not invoice_date:
             raise OdooClientError(f"Missing crucial invoice data")
+        # Odoo and the processed cache take the date as YYYY-MM-DD
+        invoice_date = invoice_date.isoformat()
 
         filename = generate_filename(meta, buyer)
 
-        # 3. Check for duplicate -> return original invoice id
-        existing = self.search(
-            model="account.move",
-            domain=[["move_type", "=", "out_invoice"], ["ref", "=", invoice_number]],
-            limit=1,
-        )
-        if existing:
-            return 0, False, filename, invoice_number, invoice_date
-
-        # 4. No duplicate -> create invoice
-        invoice_id = self.create(
-            model="account.move",
-            vals={
-                "move_type": "out_invoice",
-                "journal_id": journal_id,
-                "partner_id": partner_id,
-                "invoice_date": invoice_date,
-                "ref": invoice_number,
-                "invoice_line_ids": self.create_invoice_lines(totals),
-            }
-        )
-
-        with open(file_path, "rb") as f:
-            pdf_content = base64.b64encode(f.read()).decode('utf-8')
-
-        # 5. Create and add attachment
-        self.create(
-            model="ir.attachment",
-            vals={
-                'name': filename,
-                'type': 'binary',
-                'datas': pdf_content,
-                'res_model': 'account.move',
-                'res_id': invoice_id,
-                'mimetype': 'application/pdf',
-            }
-        )
-
-        # 6. Post invoice
-        self.button("account.move", "action_post", [invoice_id])
-
-        return invoice_id, partner_email, filename, invoice_number, invoice_date
+        # Two workers holding the same invoice number must not both pass the duplicate check,
+        # the check, create and post of one number run under one lock
+        with self._key_lock("invoice", invoice_number):
+            # 2. Check for duplicate and search the partner at the same time, read-only so both are safe to overlap
+            # Only a yes/no is needed for the duplicate, search_count builds no records
+            calls = [("account.move", "search_count", {
+                "domain": [["move_type", "=", "out_invoice"], ["ref", "=", invoice_number]],
+                "limit": 1,
+            })]
+            if buyer.vat:
+                calls.append(self._partner_search_call(buyer.vat))
+            futures = self._submit_calls(calls)
+
+            # Parse the items and totals while the lookups are in flight
+            totals = parse_body(file_path, header["text"])["totals"]
+
+            existing, *partners = [future.result() for future in futures]
+            if existing:
+                return 0, False, filename, invoice_number, invoice_date
+
+            # 3. Get partner and journal id, a partner is only created for a new invoice
+            if partners and partners[0]:
+                partner_id, partner_email = partners[0][0]["id"], partners[0][0]["email"]
+            else:
+                # Missing VAT or no partner yet, get_or_create_partner validates and creates
+                partner_id, partner_email = self.get_or_create_partner(buyer)
+
+            # Encode straight from the mapped file instead of a bytes copy, base64 output is plain ascii
+            with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pdf_content = base64.b64encode(mm).decode("ascii")
+
+            def move_vals() -> dict:
+                """ Built per attempt, a retry takes the journal, account and tax ids fetched again """
+                return {
+                    "move_type": "out_invoice",
+                    "journal_id": self.get_journal_id("VF"),
+                    "partner_id": partner_id,
+                    "invoice_date": invoice_date,
+                    "ref": invoice_number,
+                    "invoice_line_ids": self.create_invoice_lines(totals),
+                    # 5. Attachment, res_id is filled in by the one2many
+                    "attachment_ids": [(0, 0, {
+                        'name': filename,
+                        'type': 'binary',
+                        'datas': pdf_content,
+                        'res_model': 'account.move',
+                        'mimetype': 'application/pdf',
+                    })],
+                }
+
+            # 4. No duplicate -> create invoice, the attachment is created in the same call
+            try:
+                invoice_id = self.create(model="account.move", vals=move_vals())
+            except OdooClientError:
+                # A cached id removed or archived in Odoo fails every create until the TTL,
+                # only then is the cache dropped and this invoice created once more
+                if self._cached_ids_valid():
+                    raise
+                self.invalidate_cache()
+                invoice_id = self.create(model="account.move", vals=move_vals())
+
+            # 6. Post invoice
+            self.button("account.move", "action_post", [invoice_id])
+
+            return invoice_id, partner_email, filename, invoice_number, invoice_date
+
+    def create_post_invoices(self, paths: list[str], max_workers: int = 8) -> list[tuple[bool, int, str, str]]:
+        """
+        Creates and posts several invoices concurrently,
+        they share the session pool and the master data cache
+        :param paths: paths of invoice files
+        :param max_workers: invoices in flight at once
+        :return: (success, invoice id, filename, message) per path, in order of paths
+        """
+        def run(path: str) -> tuple[bool, int, str, str]:
+            try:
+                invoice_id, _, filename, invoice_number, _ = self.create_post_invoice(path)
+            except Exception as e:
+                return False, 0, os.path.basename(path), str(e)
+            if not invoice_id:
+                return False, 0, filename, f"Invoice {invoice_number} already exists"
+            return True, invoice_id, filename, f"Invoice {invoice_number} created & posted"
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="invoice") as executor:
+            return list(executor.map(run, paths))
 
     def send_peppol(self, invoice_id: int) -> tuple[bool, str]:
         """
@@ -284,24 +592,19 @@ class OdooClient:
         :return: invoice sent success / false otherwise
         """
 
-        # 1. Get partner of invoice and partner peppol state
-        invoice = self.read(
-            model="account.move",
-            ids=[invoice_id],
-            fields=["partner_id", "peppol_move_state"],
-        )[0]
+        # 1. Get partner of invoice and partner peppol state in one call,
+        # web_read follows partner_id and reads the partner field in the same request
+        invoice = self._call("account.move", "web_read", {
+            "ids": [invoice_id],
+            "specification": {
+                "peppol_move_state": {},
+                "partner_id": {"fields": {"peppol_verification_state": {}}},
+            },
+        })[0]
 
-        partner_id = invoice["partner_id"][0]
+        partner_id = invoice["partner_id"]["id"]
         move_state = invoice["peppol_move_state"]
-
-        # Get partner name from partner id
-        partner = self.read(
-            model="res.partner",
-            ids=[partner_id],
-            fields=["peppol_verification_state"],
-        )[0]
-
-        partner_state = partner["peppol_verification_state"]
+        partner_state = invoice["partner_id"]["peppol_verification_state"]
 
         # 2. If partner peppol verification not active -> make active
         if partner_state not in ("valid", "not_valid"):